@@ -178,7 +178,13 @@ class BaseAgent(MCPAggregator, AgentProtocol):
         Shutdown the agent and close all MCP server connections.
         NOTE: This method is called automatically when the agent is used as an async context manager.
         """
-        await super().close()
+        # Let providers that hold resources (e.g. a cached HTTP client) release them
+        llm_shutdown = getattr(self._llm, "shutdown", None)
+        try:
+            if llm_shutdown is not None:
+                await llm_shutdown()
+        finally:
+            await super().close()
 
     async def __call__(
         self,
@@ -76,16 +76,16 @@ class ChainAgent(BaseAgent):
         if not self.cumulative:
             response: PromptMessageMultipart = await self.agents[0].generate(multipart_messages)
             if aggregator:
-                await aggregator.add_agent_response(self.agents[0].name, response.all_text())
+                aggregator.add_agent_response(self.agents[0].name, response.all_text())
             # Process the rest of the agents in the chain
             for agent in self.agents[1:]:
                 next_message = Prompt.user(*response.content)
                 response = await agent.generate([next_message])
                 if aggregator:
-                    await aggregator.add_agent_response(agent.name, response.all_text())
+                    aggregator.add_agent_response(agent.name, response.all_text())
 
-            if aggregator and await aggregator.should_send_response():
-                await aggregator.get_aggregated_response()
+            if aggregator and aggregator.should_send_response():
+                aggregator.get_aggregated_response()
 
             return response
 
@@ -106,7 +106,7 @@ class ChainAgent(BaseAgent):
             chain_messages.extend(all_responses)
             current_response = await agent.generate(chain_messages, request_params)
             if aggregator:
-                await aggregator.add_agent_response(agent.name, current_response.all_text())
+                aggregator.add_agent_response(agent.name, current_response.all_text())
 
             # Store the response
             all_responses.append(current_response)
@@ -127,9 +127,9 @@ class ChainAgent(BaseAgent):
             content=[TextContent(type="text", text=response_text)],
         )
         if aggregator:
-            await aggregator.add_agent_response(self.name, response_text)
-            if await aggregator.should_send_response():
-                await aggregator.get_aggregated_response()
+            aggregator.add_agent_response(self.name, response_text)
+            if aggregator.should_send_response():
+                aggregator.get_aggregated_response()
 
         return final_message
 
@@ -19,7 +19,11 @@ class Memory(Protocol, Generic[MessageParamT]):
 
     def append(self, message: MessageParamT, is_prompt: bool = False) -> None: ...
 
-    def get(self, include_completion_history: bool = True) -> List[MessageParamT]: ...
+    def get(self, include_completion_history: bool = True) -> List[MessageParamT]:
+        """Return the messages as a new list, which the caller is free to modify."""
+        ...
+
+    def prompt_count(self) -> int: ...
 
     def clear(self, clear_prompts: bool = False) -> None: ...
 
@@ -84,13 +88,22 @@ class SimpleMemory(Memory, Generic[MessageParamT]):
                              If False, only return prompt messages
 
         Returns:
-            Combined list of prompt messages and optionally history messages
+            New combined list of prompt messages and optionally history messages
         """
         if include_completion_history:
             return self.prompt_messages + self.history
         else:
             return self.prompt_messages.copy()
 
+    def prompt_count(self) -> int:
+        """
+        Get the number of prompt messages without copying them.
+
+        Returns:
+            Number of messages in prompt_messages
+        """
+        return len(self.prompt_messages)
+
     def clear(self, clear_prompts: bool = False) -> None:
         """
         Clear history and optionally prompt messages.
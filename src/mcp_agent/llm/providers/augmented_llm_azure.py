@@ -1,24 +1,64 @@
-from openai import AuthenticationError, AzureOpenAI, OpenAI
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Coroutine, Dict
+from urllib.parse import urlparse
+
+from openai import AsyncAzureOpenAI, AuthenticationError
+from openai.types.chat import ChatCompletion
 
 from mcp_agent.core.exceptions import ProviderKeyError
 from mcp_agent.llm.provider_types import Provider
 from mcp_agent.llm.providers.augmented_llm_openai import OpenAIAugmentedLLM
 
-try:
-    from azure.identity import DefaultAzureCredential
-except ImportError:
-    DefaultAzureCredential = None
+_AZURE_SUFFIX = ".openai.azure.com"
 
 
 def _extract_resource_name(url: str) -> str | None:
-    from urllib.parse import urlparse
-
     host = urlparse(url).hostname or ""
-    suffix = ".openai.azure.com"
-    return host.replace(suffix, "") if host.endswith(suffix) else None
+    return host[: -len(_AZURE_SUFFIX)] if host.endswith(_AZURE_SUFFIX) else None
 
 
 DEFAULT_AZURE_API_VERSION = "2023-05-15"
+_AZURE_SCOPE = "https://cognitiveservices.azure.com/.default"
+# Refresh Azure AD tokens this many seconds before they expire
+_TOKEN_REFRESH_MARGIN = 60
+
+
+@dataclass(frozen=True, slots=True)
+class _AzureResolved:
+    """Azure client settings, resolved and validated once from the config."""
+
+    api_key: str | None
+    base_url: str
+    api_version: str
+    deployment_name: str | None
+    use_default_cred: bool
+    resource_name: str | None
+
+
+class _TokenCache:
+    """Reuses an Azure AD access token until shortly before it expires."""
+
+    def __init__(self, credential, scope: str) -> None:
+        # An azure.identity.aio credential, so fetching a token never blocks the event loop
+        self._credential = credential
+        self._scope = scope
+        self._token: str | None = None
+        self._expires_on = 0
+        # Serializes refreshes so concurrent requests share a single token fetch
+        self._lock = asyncio.Lock()
+
+    async def get_token(self) -> str:
+        async with self._lock:
+            if self._token is None or time.time() >= self._expires_on - _TOKEN_REFRESH_MARGIN:
+                access_token = await self._credential.get_token(self._scope)
+                self._token = access_token.token
+                self._expires_on = access_token.expires_on
+            return self._token
+
+    async def close(self) -> None:
+        await self._credential.close()
 
 
 class AzureOpenAIAugmentedLLM(OpenAIAugmentedLLM):
@@ -31,99 +71,121 @@ class AzureOpenAIAugmentedLLM(OpenAIAugmentedLLM):
         # Set provider to AZURE, pass through to base
         super().__init__(provider=provider, *args, **kwargs)
 
-        # Context/config extraction
-        context = getattr(self, "context", None)
-        config = getattr(context, "config", None) if context else None
-        azure_cfg = getattr(config, "azure", None) if config else None
+        # Client is built lazily and reused so its connection pool survives across completions
+        self._cached_client: AsyncAzureOpenAI | None = None
+        # Built alongside the client when using DefaultAzureCredential
+        self._token_cache: _TokenCache | None = None
 
+        azure_cfg = self.context.config.azure if self.context and self.context.config else None
         if azure_cfg is None:
             raise ProviderKeyError(
                 "Missing Azure configuration",
                 "Azure provider requires configuration section 'azure' in your config file.",
             )
 
-        self.use_default_cred = getattr(azure_cfg, "use_default_azure_credential", False)
-        default_request_params = getattr(self, "default_request_params", None)
-        self.deployment_name = getattr(default_request_params, "model", None) or getattr(
-            azure_cfg, "azure_deployment", None
-        )
-        self.api_version = getattr(azure_cfg, "api_version", None) or DEFAULT_AZURE_API_VERSION
+        self._azure = self._resolve_azure_config(azure_cfg)
 
-        if self.use_default_cred:
-            self.base_url = getattr(azure_cfg, "base_url", None)
-            if not self.base_url:
-                raise ProviderKeyError(
-                    "Missing Azure endpoint",
-                    "When using 'use_default_azure_credential', 'base_url' is required in azure config.",
-                )
-            if DefaultAzureCredential is None:
+        if self._azure.use_default_cred:
+            # Imported here so API key users don't pay for loading azure-identity
+            try:
+                from azure.identity.aio import DefaultAzureCredential
+            except ImportError as e:
                 raise ProviderKeyError(
                     "azure-identity not installed",
                     "You must install 'azure-identity' to use DefaultAzureCredential authentication.",
-                )
-            self.credential = DefaultAzureCredential()
-
-            def get_azure_token():
-                token = self.credential.get_token("https://cognitiveservices.azure.com/.default")
-                return token.token
-
-            self.get_azure_token = get_azure_token
-        else:
-            self.api_key = getattr(azure_cfg, "api_key", None)
-            self.resource_name = getattr(azure_cfg, "resource_name", None)
-            self.base_url = getattr(azure_cfg, "base_url", None) or (
-                f"https://{self.resource_name}.openai.azure.com/" if self.resource_name else None
-            )
-            if not self.api_key:
-                raise ProviderKeyError(
-                    "Missing Azure OpenAI credentials",
-                    "Field 'api_key' is required in azure config.",
-                )
-            if not (self.resource_name or self.base_url):
+                ) from e
+            self._credential_cls = DefaultAzureCredential
+
+    def _resolve_azure_config(self, azure_cfg) -> _AzureResolved:
+        """Validate the azure config section once and resolve the client settings."""
+        use_default_cred = getattr(azure_cfg, "use_default_azure_credential", False)
+        deployment_name = (
+            self.default_request_params.model if self.default_request_params else None
+        ) or azure_cfg.azure_deployment
+        api_version = azure_cfg.api_version or DEFAULT_AZURE_API_VERSION
+
+        if use_default_cred:
+            if not azure_cfg.base_url:
                 raise ProviderKeyError(
                     "Missing Azure endpoint",
-                    "Provide either 'resource_name' or 'base_url' under azure config.",
-                )
-            if not self.deployment_name:
-                raise ProviderKeyError(
-                    "Missing deployment name",
-                    "Set 'azure_deployment' in config or pass model=<deployment>.",
+                    "When using 'use_default_azure_credential', 'base_url' is required in azure config.",
                 )
-            # If resource_name was missing, try to extract it from base_url
-            if not self.resource_name and self.base_url:
-                self.resource_name = _extract_resource_name(self.base_url)
+            return _AzureResolved(
+                api_key=None,
+                base_url=azure_cfg.base_url,
+                api_version=api_version,
+                deployment_name=deployment_name,
+                use_default_cred=True,
+                resource_name=azure_cfg.resource_name,
+            )
 
-    def _openai_client(self) -> OpenAI:
+        api_key = azure_cfg.api_key
+        resource_name = azure_cfg.resource_name
+        base_url = azure_cfg.base_url or (
+            f"https://{resource_name}{_AZURE_SUFFIX}/" if resource_name else None
+        )
+        if not api_key:
+            raise ProviderKeyError(
+                "Missing Azure OpenAI credentials",
+                "Field 'api_key' is required in azure config.",
+            )
+        if not (resource_name or base_url):
+            raise ProviderKeyError(
+                "Missing Azure endpoint",
+                "Provide either 'resource_name' or 'base_url' under azure config.",
+            )
+        if not deployment_name:
+            raise ProviderKeyError(
+                "Missing deployment name",
+                "Set 'azure_deployment' in config or pass model=<deployment>.",
+            )
+        # If resource_name was missing, try to extract it from base_url
+        if not resource_name:
+            resource_name = _extract_resource_name(base_url)
+
+        return _AzureResolved(
+            api_key=api_key,
+            base_url=base_url,
+            api_version=api_version,
+            deployment_name=deployment_name,
+            use_default_cred=False,
+            resource_name=resource_name,
+        )
+
+    async def _get_azure_token(self) -> str:
+        return await self._token_cache.get_token()
+
+    def _openai_client(self) -> AsyncAzureOpenAI:
         """
-        Returns an AzureOpenAI client, handling both API Key and DefaultAzureCredential.
+        Returns an AsyncAzureOpenAI client, handling both API Key and DefaultAzureCredential.
+        The client is built on first use and reused, as the resolved settings never change.
         """
+        if self._cached_client is None:
+            self._cached_client = self._create_client()
+        return self._cached_client
+
+    def _completion_task(self, arguments: Dict[str, Any]) -> Coroutine[Any, Any, ChatCompletion]:
+        # create() on the async client is a plain method returning a coroutine, so hand
+        # the executor the coroutine rather than a callable it would run in a worker thread
+        return self._openai_client().chat.completions.create(**arguments)
+
+    def _create_client(self) -> AsyncAzureOpenAI:
+        azure = self._azure
+        if azure.use_default_cred:
+            self._token_cache = _TokenCache(self._credential_cls(), _AZURE_SCOPE)
+            auth = {"azure_ad_token_provider": self._get_azure_token}
+        else:
+            auth = {"api_key": azure.api_key}
+
         try:
-            if self.use_default_cred:
-                if self.base_url is None:
-                    raise ProviderKeyError(
-                        "Missing Azure endpoint",
-                        "azure_endpoint (base_url) is None at client creation time.",
-                    )
-                return AzureOpenAI(
-                    azure_ad_token_provider=self.get_azure_token,
-                    azure_endpoint=self.base_url,
-                    api_version=self.api_version,
-                    azure_deployment=self.deployment_name,
-                )
-            else:
-                if self.base_url is None:
-                    raise ProviderKeyError(
-                        "Missing Azure endpoint",
-                        "azure_endpoint (base_url) is None at client creation time.",
-                    )
-                return AzureOpenAI(
-                    api_key=self.api_key,
-                    azure_endpoint=self.base_url,
-                    api_version=self.api_version,
-                    azure_deployment=self.deployment_name,
-                )
+            return AsyncAzureOpenAI(
+                **auth,
+                azure_endpoint=azure.base_url,
+                api_version=azure.api_version,
+                azure_deployment=azure.deployment_name,
+            )
         except AuthenticationError as e:
-            if self.use_default_cred:
+            if azure.use_default_cred:
                 raise ProviderKeyError(
                     "Invalid Azure AD credentials",
                     "The configured Azure AD credentials were rejected.\n"
@@ -135,3 +197,23 @@ class AzureOpenAIAugmentedLLM(OpenAIAugmentedLLM):
                     "The configured Azure OpenAI API key was rejected.\n"
                     "Please check that your API key is valid and not expired.",
                 ) from e
+
+    async def shutdown(self):
+        """
+        Close the cached AsyncAzureOpenAI client and its Azure AD credential, if initialized.
+        Both are rebuilt on the next completion.
+        """
+        client, self._cached_client = self._cached_client, None
+        token_cache, self._token_cache = self._token_cache, None
+        if client is not None:
+            try:
+                await client.close()
+                self.logger.debug("AsyncAzureOpenAI client closed.")
+            except Exception as e:
+                self.logger.error(f"Error closing AsyncAzureOpenAI client: {e}")
+        if token_cache is not None:
+            try:
+                await token_cache.close()
+                self.logger.debug("Azure AD credential closed.")
+            except Exception as e:
+                self.logger.error(f"Error closing Azure AD credential: {e}")
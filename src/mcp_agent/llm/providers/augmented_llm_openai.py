@@ -1,4 +1,5 @@
-from typing import Dict, List
+import functools
+from typing import Any, Callable, Coroutine, Dict, List
 
 from mcp.types import (
     CallToolRequest,
@@ -12,6 +13,7 @@ from openai import AuthenticationError, OpenAI
 
 # from openai.types.beta.chat import
 from openai.types.chat import (
+    ChatCompletion,
     ChatCompletionMessage,
     ChatCompletionMessageParam,
     ChatCompletionSystemMessageParam,
@@ -113,6 +115,16 @@ class OpenAIAugmentedLLM(AugmentedLLM[ChatCompletionMessageParam, ChatCompletion
                 "Please check that your API key is valid and not expired.",
             ) from e
 
+    def _completion_task(
+        self, arguments: Dict[str, Any]
+    ) -> Callable[[], ChatCompletion] | Coroutine[Any, Any, ChatCompletion]:
+        """
+        Return the chat completion request in the form the executor should run it.
+        The sync client blocks, so it is returned as a callable for a worker thread;
+        providers with an async client override this to return the coroutine itself.
+        """
+        return functools.partial(self._openai_client().chat.completions.create, **arguments)
+
     async def _openai_completion(
         self,
         message: OpenAIMessage,
@@ -129,12 +141,16 @@ class OpenAIAugmentedLLM(AugmentedLLM[ChatCompletionMessageParam, ChatCompletion
         responses: List[TextContent | ImageContent | EmbeddedResource] = []
 
         # TODO -- move this in to agent context management / agent group handling
-        messages: List[ChatCompletionMessageParam] = []
+        # Memory.get() returns a new list, so build on it rather than copying it again
+        messages: List[ChatCompletionMessageParam] = self.history.get(
+            include_completion_history=request_params.use_history
+        )
         system_prompt = self.instruction or request_params.systemPrompt
         if system_prompt:
-            messages.append(ChatCompletionSystemMessageParam(role="system", content=system_prompt))
+            messages.insert(
+                0, ChatCompletionSystemMessageParam(role="system", content=system_prompt)
+            )
 
-        messages.extend(self.history.get(include_completion_history=request_params.use_history))
         messages.append(message)
 
         response = await self.aggregator.list_tools()
@@ -160,9 +176,7 @@ class OpenAIAugmentedLLM(AugmentedLLM[ChatCompletionMessageParam, ChatCompletion
 
             self._log_chat_progress(self.chat_turn(), model=self.default_request_params.model)
 
-            executor_result = await self.executor.execute(
-                self._openai_client().chat.completions.create, **arguments
-            )
+            executor_result = await self.executor.execute(self._completion_task(arguments))
 
             response = executor_result[0]
 
@@ -181,7 +195,7 @@ class OpenAIAugmentedLLM(AugmentedLLM[ChatCompletionMessageParam, ChatCompletion
                 self.logger.error(f"Error: {response}")
                 break
 
-            if not response.choices or len(response.choices) == 0:
+            if not response.choices:
                 # No response from the model, we're done
                 break
 
@@ -268,16 +282,13 @@ class OpenAIAugmentedLLM(AugmentedLLM[ChatCompletionMessageParam, ChatCompletion
                 break
 
         if request_params.use_history:
-            # Get current prompt messages
-            prompt_messages = self.history.get(include_completion_history=False)
-
-            # Calculate new conversation messages (excluding prompts)
-            new_messages = messages[len(prompt_messages) :]
-
+            # Skip the system prompt and current prompt messages, slicing only once
+            prompt_count = self.history.prompt_count()
             if system_prompt:
-                new_messages = new_messages[1:]
+                prompt_count += 1
 
-            self.history.set(new_messages)
+            # Calculate new conversation messages (excluding prompts)
+            self.history.set(messages[prompt_count:])
 
         self._log_chat_finished(model=self.default_request_params.model)
 
@@ -291,22 +302,24 @@ class OpenAIAugmentedLLM(AugmentedLLM[ChatCompletionMessageParam, ChatCompletion
     ) -> PromptMessageMultipart:
         last_message = multipart_messages[-1]
 
-        # Add all previous messages to history (or all messages if last is from assistant)
-        # if the last message is a "user" inference is required
-        messages_to_add = (
-            multipart_messages[:-1] if last_message.role == "user" else multipart_messages
-        )
-        converted = []
-        for msg in messages_to_add:
-            converted.append(OpenAIConverter.convert_to_openai(msg))
-
-        # TODO -- this looks like a defect from previous apply_prompt implementation.
-        self.history.extend(converted, is_prompt=is_template)
-
+        # For assistant messages: add everything to history and return the last message
+        # (no completion needed)
         if "assistant" == last_message.role:
+            self.history.extend(
+                [OpenAIConverter.convert_to_openai(msg) for msg in multipart_messages],
+                is_prompt=is_template,
+            )
             return last_message
 
-        # For assistant messages: Return the last message (no completion needed)
+        # The last message is from the user so inference is required;
+        # add all previous messages to history
+        converted = [OpenAIConverter.convert_to_openai(msg) for msg in multipart_messages[:-1]]
+
+        # TODO -- this looks like a defect from previous apply_prompt implementation.
+        # Nothing to record for a single user turn, which is the common case
+        if converted:
+            self.history.extend(converted, is_prompt=is_template)
+
         message_param: OpenAIMessage = OpenAIConverter.convert_to_openai(last_message)
         responses: List[
             TextContent | ImageContent | EmbeddedResource
@@ -7,6 +7,14 @@ from typing import Any, Dict
 class ChainResponseAggregator:
     """Aggregate responses for a multi-agent chain."""
 
+    __slots__ = (
+        "chain_name",
+        "total_agents",
+        "agent_responses",
+        "completed_agents",
+        "_response_sent",
+    )
+
     def __init__(self, chain_name: str, total_agents: int) -> None:
         self.chain_name = chain_name
         self.total_agents = total_agents
@@ -14,16 +22,17 @@ class ChainResponseAggregator:
         self.completed_agents = 0
         self._response_sent = False
 
-    async def add_agent_response(self, agent_name: str, response: Any) -> None:
+    def add_agent_response(self, agent_name: str, response: Any) -> None:
         """Record a response from an agent in the chain."""
         self.agent_responses[agent_name] = response
+        # Counted separately: a chain may run the same agent more than once
         self.completed_agents += 1
 
-    async def should_send_response(self) -> bool:
+    def should_send_response(self) -> bool:
         """Return ``True`` if the aggregated response should be sent."""
         return not self._response_sent and self.completed_agents >= self.total_agents
 
-    async def get_aggregated_response(self) -> Dict[str, Any]:
+    def get_aggregated_response(self) -> Dict[str, Any]:
         """Return the aggregated response for the chain."""
         self._response_sent = True
         return {"chain": self.chain_name, "responses": self.agent_responses}
@@ -37,7 +46,12 @@ class SSEEventType(Enum):
     ERROR = "error"
 
 
+# Event names resolved once rather than through the enum ``value`` descriptor per event
+_EVENT_NAMES: Dict[SSEEventType, str] = {e: e.value for e in SSEEventType}
+
+
 async def send_sse_event(event_type: SSEEventType, data: Dict[str, Any], stream: Any) -> None:
     """Send an SSE event to the provided stream if possible."""
-    if stream is not None and hasattr(stream, "send"):
-        await stream.send({"event": event_type.value, "data": data})
+    send = getattr(stream, "send", None)
+    if send is not None:
+        await send({"event": _EVENT_NAMES[event_type], "data": data})
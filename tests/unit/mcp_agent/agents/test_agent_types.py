@@ -2,11 +2,37 @@
 Unit tests for agent types and their interactions with the interactive prompt.
 """
 
+from unittest.mock import AsyncMock
+
+import pytest
+
 from mcp_agent.agents.agent import Agent
 from mcp_agent.core.agent_types import AgentConfig, AgentType
+from mcp_agent.mcp.mcp_aggregator import MCPAggregator
 
 
 def test_agent_type_default():
     """Test that agent_type defaults to AgentType.BASIC.value"""
     agent = Agent(config=AgentConfig(name="test_agent"))
     assert agent.agent_type == AgentType.BASIC
+
+
+async def test_agent_shutdown_shuts_down_llm():
+    """Test that shutting down an agent also shuts down its attached LLM"""
+    agent = Agent(config=AgentConfig(name="test_agent"))
+    agent._llm = AsyncMock()
+    await agent.shutdown()
+    agent._llm.shutdown.assert_awaited_once()
+
+
+async def test_agent_shutdown_closes_connections_when_llm_shutdown_fails(monkeypatch):
+    """Test that MCP connections are closed even if the LLM fails to shut down"""
+    close = AsyncMock()
+    monkeypatch.setattr(MCPAggregator, "close", close)
+    agent = Agent(config=AgentConfig(name="test_agent"))
+    agent._llm = AsyncMock()
+    agent._llm.shutdown.side_effect = RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await agent.shutdown()
+    close.assert_awaited_once()
@@ -1,99 +1,273 @@
+import threading
+import time
 import types
-from typing import Optional
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from mcp.types import ListToolsResult, TextContent
+from openai import AsyncAzureOpenAI
+from openai.types.chat import ChatCompletionMessage
 
-from mcp_agent.llm.providers.augmented_llm_azure import AzureOpenAIAugmentedLLM
+import mcp_agent.llm.providers.augmented_llm_azure as azure_mod
+from mcp_agent.core.prompt import Prompt
+from mcp_agent.executor.executor import AsyncioExecutor
+from mcp_agent.llm.providers.augmented_llm_azure import AzureOpenAIAugmentedLLM, _TokenCache
+from mcp_agent.mcp.prompt_message_multipart import PromptMessageMultipart
 
+_PING_MSG = PromptMessageMultipart(role="user", content=[TextContent(type="text", text="ping")])
 
-class DummyLogger:
-    enable_markup = True
 
+def _completion(content):
+    return types.SimpleNamespace(
+        choices=[
+            types.SimpleNamespace(
+                finish_reason="stop",
+                message=ChatCompletionMessage(role="assistant", content=content),
+            )
+        ]
+    )
+
+
+# Canned responses are built once and shared; tests must not mutate them
+_PONG = _completion("pong")
+_OK = _completion("ok")
+_NONE = _completion(None)
+_EMPTY = types.SimpleNamespace(choices=[])
+
+
+def _context(**azure_overrides):
+    azure = {
+        "api_key": "test-key",
+        "resource_name": "test-resource",
+        "azure_deployment": "test-deployment",
+        "api_version": "2023-05-15",
+        "base_url": None,
+        "use_default_azure_credential": False,
+        **azure_overrides,
+    }
+    return types.SimpleNamespace(
+        config=types.SimpleNamespace(
+            azure=types.SimpleNamespace(**azure),
+            logger=types.SimpleNamespace(enable_markup=True, show_chat=False),
+            openai=None,  # For compatibility with OpenAIAugmentedLLM
+        ),
+        executor=AsyncioExecutor(),
+    )
+
+
+# Contexts are shared across tests; the LLM only reads from them
+_DUMMY_CTX = _context()
+_DUMMY_CTX_BASEURL = _context(base_url="https://mydemo.openai.azure.com/", resource_name=None)
+_DUMMY_CTX_DAC = _context(
+    api_key=None,
+    resource_name=None,
+    base_url="https://mydemo.openai.azure.com/",
+    use_default_azure_credential=True,
+)
 
-class DummyAzureConfig:
+
+class _FakeAzureOpenAI:
+    """Stands in for AsyncAzureOpenAI: records its kwargs and exposes a mocked create."""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.chat = MagicMock()
+        self.chat.completions.create = AsyncMock()
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeDefaultAzureCredential:
     def __init__(self):
-        self.api_key: Optional[str] = "test-key"
-        self.resource_name: Optional[str] = "test-resource"
-        self.azure_deployment: Optional[str] = "test-deployment"
-        self.api_version: Optional[str] = "2023-05-15"
-        self.base_url: Optional[str] = None
-        self.use_default_azure_credential: bool = False
+        self.closed = False
+
+    async def get_token(self, scope):
+        assert scope == "https://cognitiveservices.azure.com/.default"
+        assert not self.closed
+        return types.SimpleNamespace(token="dummy-token", expires_on=time.time() + 3600)
 
+    async def close(self):
+        self.closed = True
 
-class DummyConfig:
-    def __init__(self, azure_cfg=None):
-        self.azure = azure_cfg or DummyAzureConfig()
-        self.logger = DummyLogger()
-        self.openai = None  # For compatibility with OpenAIAugmentedLLM
 
+@pytest.fixture
+def fake_azure_sdk(monkeypatch):
+    monkeypatch.setattr(azure_mod, "AsyncAzureOpenAI", _FakeAzureOpenAI)
+    monkeypatch.setattr("azure.identity.aio.DefaultAzureCredential", _FakeDefaultAzureCredential)
 
-class DummyContext:
-    def __init__(self, azure_cfg=None):
-        self.config = DummyConfig(azure_cfg=azure_cfg)
-        self.executor = None
+
+@pytest.fixture(scope="module")
+def azure_llm_shared():
+    llm = AzureOpenAIAugmentedLLM(context=_DUMMY_CTX)
+    llm.aggregator = AsyncMock()
+    llm.aggregator.list_tools.return_value = ListToolsResult(tools=[])
+    return llm
+
+
+@pytest.fixture
+def azure_llm(azure_llm_shared, fake_azure_sdk, monkeypatch):
+    # The LLM is shared across the module, so each test starts with empty history
+    # and a client built from the fake SDK
+    azure_llm_shared.history.clear(clear_prompts=True)
+    monkeypatch.setattr(azure_llm_shared, "_cached_client", None)
+    return azure_llm_shared
 
 
 def test_openai_client_with_base_url_only():
-    cfg = DummyAzureConfig()
-    cfg.base_url = "https://mydemo.openai.azure.com/"
-    cfg.resource_name = None
-    ctx = DummyContext(azure_cfg=cfg)
-    llm = AzureOpenAIAugmentedLLM(context=ctx)
+    llm = AzureOpenAIAugmentedLLM(context=_DUMMY_CTX_BASEURL)
+    assert llm._azure.resource_name == "mydemo"
     client = llm._openai_client()
-    assert hasattr(client, "chat")
-    # Should be AzureOpenAI instance
-
-
-@pytest.mark.asyncio
-async def test_openai_client_with_default_azure_credential(monkeypatch):
-    """
-    Test AzureOpenAIAugmentedLLM with use_default_azure_credential: True.
-    Mocks DefaultAzureCredential and AzureOpenAI to ensure correct integration.
-    """
-
-    class DummyToken:
-        def __init__(self, token):
-            self.token = token
-
-    class DummyCredential:
-        def get_token(self, scope):
-            assert scope == "https://cognitiveservices.azure.com/.default"
-            return DummyToken("dummy-token")
-
-    import mcp_agent.llm.providers.augmented_llm_azure as azure_mod
-
-    monkeypatch.setattr(azure_mod, "DefaultAzureCredential", DummyCredential)
-
-    class DummyAzureOpenAI:
-        def __init__(self, **kwargs):
-            assert "azure_ad_token_provider" in kwargs
-            self.token_provider = kwargs["azure_ad_token_provider"]
-            self.chat = types.SimpleNamespace(
-                completions=types.SimpleNamespace(
-                    create=lambda **kw: types.SimpleNamespace(
-                        choices=[
-                            types.SimpleNamespace(
-                                message=types.SimpleNamespace(content="tokenpong")
-                            )
-                        ]
-                    )
-                )
-            )
+    assert isinstance(client, AsyncAzureOpenAI)
+
+
+def test_openai_client_is_reused(azure_llm):
+    client = azure_llm._openai_client()
+    assert azure_llm._openai_client() is client
+
+
+@pytest.mark.parametrize(
+    "context,auth_kwarg,other_kwarg,credential",
+    [
+        (_DUMMY_CTX, "api_key", "azure_ad_token_provider", "test-key"),
+        (_DUMMY_CTX_DAC, "azure_ad_token_provider", "api_key", "dummy-token"),
+    ],
+    ids=["api_key", "default_azure_credential"],
+)
+async def test_openai_client_auth_modes(
+    fake_azure_sdk, context, auth_kwarg, other_kwarg, credential
+):
+    client = AzureOpenAIAugmentedLLM(context=context)._openai_client()
+    assert auth_kwarg in client.kwargs
+    assert other_kwarg not in client.kwargs
+
+    value = client.kwargs[auth_kwarg]
+    if callable(value):
+        value = await value()
+    assert value == credential
+
+
+async def test_shutdown_closes_client_and_credential(fake_azure_sdk):
+    llm = AzureOpenAIAugmentedLLM(context=_DUMMY_CTX_DAC)
+    client = llm._openai_client()
+    credential = llm._token_cache._credential
+
+    await llm.shutdown()
+    assert client.closed
+    assert credential.closed
+    assert llm._cached_client is None
 
-    monkeypatch.setattr(azure_mod, "AzureOpenAI", DummyAzureOpenAI)
+    # The next completion gets a fresh client backed by a fresh credential
+    new_client = llm._openai_client()
+    assert new_client is not client
+    assert await new_client.kwargs["azure_ad_token_provider"]() == "dummy-token"
 
-    class DACfg:
+
+async def test_shutdown_logs_close_errors(fake_azure_sdk, monkeypatch):
+    llm = AzureOpenAIAugmentedLLM(context=_DUMMY_CTX_DAC)
+    client = llm._openai_client()
+    credential = llm._token_cache._credential
+    monkeypatch.setattr(client, "close", AsyncMock(side_effect=RuntimeError("boom")))
+
+    await llm.shutdown()
+    assert credential.closed
+    assert llm._cached_client is None
+
+
+async def test_token_cache_reuses_token_until_expiry(monkeypatch):
+    class CountingCredential:
         def __init__(self):
-            self.api_key = None
-            self.resource_name = None
-            self.azure_deployment = "test-deployment"
-            self.api_version = "2023-05-15"
-            self.base_url = "https://mydemo.openai.azure.com/"
-            self.use_default_azure_credential = True
-
-    dacfg = DACfg()
-    ctx = DummyContext(azure_cfg=dacfg)
-    llm = AzureOpenAIAugmentedLLM(context=ctx)
+            self.calls = 0
+
+        async def get_token(self, scope):
+            self.calls += 1
+            return types.SimpleNamespace(token=f"token-{self.calls}", expires_on=1000)
+
+    credential = CountingCredential()
+    cache = _TokenCache(credential, "scope")
+
+    monkeypatch.setattr(azure_mod.time, "time", lambda: 500)
+    assert await cache.get_token() == "token-1"
+    assert await cache.get_token() == "token-1"
+    assert credential.calls == 1
+
+    # Within the refresh margin of expiry a new token is fetched
+    monkeypatch.setattr(azure_mod.time, "time", lambda: 950)
+    assert await cache.get_token() == "token-2"
+    assert credential.calls == 2
+
+
+@pytest.mark.parametrize(
+    "response,expected",
+    [
+        (_PONG, "pong"),
+        (_EMPTY, "<no text>"),
+        (_NONE, "<no text>"),
+    ],
+    ids=["content", "no_choices", "content_none"],
+)
+async def test_azure_llm_response_shapes(azure_llm, response, expected):
+    azure_llm._openai_client().chat.completions.create.return_value = response
+
+    result = await azure_llm.generate([_PING_MSG])
+    assert result.last_text() == expected
+
+
+async def test_openai_payload_is_plain_string(azure_llm):
+    client = azure_llm._openai_client()
+    client.chat.completions.create.return_value = _OK
+
+    await azure_llm.generate([_PING_MSG])
+    # The request list is extended with the reply afterwards, so check the user turn only
+    messages = client.chat.completions.create.call_args.kwargs["messages"]
+    assert messages[0] == {"role": "user", "content": "ping"}
+
+
+async def test_completion_is_not_dispatched_to_a_worker_thread(azure_llm):
+    # Like the real SDK, create() is a plain method that returns a coroutine
+    calling_threads = []
+
+    def create(**kwargs):
+        calling_threads.append(threading.current_thread())
+
+        async def request():
+            return _OK
+
+        return request()
+
+    azure_llm._openai_client().chat.completions.create = create
+
+    result = await azure_llm.generate([_PING_MSG])
+    assert result.last_text() == "ok"
+    assert calling_threads == [threading.main_thread()]
+
+
+async def test_history_across_turns_with_instruction_and_template(fake_azure_sdk):
+    llm = AzureOpenAIAugmentedLLM(context=_DUMMY_CTX, instruction="be brief")
+    llm.aggregator = AsyncMock()
+    llm.aggregator.list_tools.return_value = ListToolsResult(tools=[])
     client = llm._openai_client()
-    # Just checking that the client is created and has chat
-    assert hasattr(client, "chat")
+    client.chat.completions.create.return_value = _OK
+    reply = _OK.choices[0].message
+
+    # An assistant-final template is stored as prompt messages without a completion
+    await llm._apply_prompt_provider_specific(
+        [Prompt.user("hi"), Prompt.assistant("hello")], is_template=True
+    )
+    await llm.generate([Prompt.user("ping")])
+    await llm.generate([Prompt.user("again")])
+
+    template = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}]
+    turns = [
+        {"role": "user", "content": "ping"},
+        reply,
+        {"role": "user", "content": "again"},
+        reply,
+    ]
+    assert llm.history.prompt_count() == 2
+    assert llm.history.prompt_messages == template
+    # Neither the system prompt nor the template is copied into the conversation history
+    assert llm.history.history == turns
+    messages = client.chat.completions.create.call_args.kwargs["messages"]
+    assert messages == [{"role": "system", "content": "be brief"}, *template, *turns]